@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Benchmark.
+
+Measures, in fresh interpreters, how long each startup path takes and which
+heavy dependencies it loads. Showing the window should not load the crawl
+dependencies, and the headless core should not load Qt.
+
+Usage:
+    python benchmarks/cold_start.py [--runs N] [--root PATH]
+
+`--root` points at another checkout (e.g. a baseline worktree) to compare.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY_MODULES = ['PyQt6.QtWidgets', 'httpx', 'bs4', 'lxml', 'markdownify']
+
+_SAMPLE_PAGE = ("<html><body><nav>menu</nav><main><h1>Title</h1>"
+                + "<p>Some documentation text.</p>" * 50 + "</main><footer>f</footer></body></html>")
+
+# name -> (untimed setup, timed statement)
+TARGETS = {
+    "window shown": (
+        "import os; os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')",
+        "from PyQt6.QtWidgets import QApplication; from src.ui.main_window import MainWindow; "
+        "app = QApplication([]); window = MainWindow(); window.show(); app.processEvents()",
+    ),
+    "import main": ("", "import main"),
+    "headless core": (
+        "",
+        "from src.core.crawler import Crawler; from src.core.processor import ContentProcessor",
+    ),
+    "200 processors": (
+        f"from src.core.processor import ContentProcessor; page = {_SAMPLE_PAGE!r}",
+        "for _ in range(200): ContentProcessor()._extract_main_content(page)",
+    ),
+}
+
+_PROBE = """
+import json, sys, time
+{setup}
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_once(root: str, setup: str, statement: str) -> dict:
+    """Runs `statement` in a fresh interpreter rooted at `root` and returns its timing probe."""
+    probe = _PROBE.format(setup=setup, statement=statement, heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, '-c', probe], cwd=root, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument('--root', default=PROJECT_ROOT, help="checkout to benchmark")
+    args = parser.parse_args()
+
+    for name, (setup, statement) in TARGETS.items():
+        try:
+            probes = [run_once(args.root, setup, statement) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name:>14}: failed ({e})")
+            continue
+        median_ms = statistics.median(p["seconds"] for p in probes) * 1000
+        loaded = ', '.join(probes[0]["loaded"]) or "none"
+        print(f"{name:>14}: {median_ms:8.1f} ms median over {args.runs} runs; heavy modules: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
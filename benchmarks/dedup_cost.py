@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Cost Benchmark.
+
+Compares, on a synthetic documentation page, the cost of fingerprinting a
+page's main content with the cost of the Markdown conversion that skipping a
+near-duplicate saves. Fingerprinting must be cheaper for dedup to pay off.
+
+Usage:
+    python benchmarks/dedup_cost.py [--words N] [--runs N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from src.core.dedup import simhash  # noqa: E402
+from src.core.extraction import extract_main_content  # noqa: E402
+from src.core.processor import ContentProcessor  # noqa: E402
+
+
+def build_page(word_count: int) -> str:
+    """Builds a page with navigation chrome and `word_count` words of main content."""
+    rng = random.Random(0)
+    vocabulary = [''.join(rng.choice('abcdefghijklmnop') for _ in range(rng.randint(2, 9)))
+                  for _ in range(2000)]
+    paragraphs = []
+    for _ in range(word_count // 100):
+        words = ' '.join(rng.choice(vocabulary) for _ in range(100))
+        paragraphs.append(f"<h2>Section</h2><p>{words} <a href='/x'>link</a> <code>value</code></p>")
+    nav = ''.join(f"<li><a href='/page{i}'>Page {i}</a></li>" for i in range(200))
+    return (f"<html><head><title>Doc</title></head><body><nav><ul>{nav}</ul></nav>"
+            f"<main>{''.join(paragraphs)}</main><footer>Footer</footer></body></html>")
+
+
+def median_ms(func, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--words', type=int, default=3000, help="words of main content")
+    parser.add_argument('--runs', type=int, default=20, help="repetitions per stage")
+    args = parser.parse_args()
+
+    page = build_page(args.words)
+    processor = ContentProcessor()
+    main_content = extract_main_content(BeautifulSoup(page, 'lxml'))
+    text = main_content.get_text(' ')
+
+    stages = {
+        "parse + extraction (shared)": lambda: extract_main_content(BeautifulSoup(page, 'lxml')),
+        "fingerprint (get_text + simhash)": lambda: simhash(main_content.get_text(' ')),
+        "  of which simhash": lambda: simhash(text),
+        "conversion saved per duplicate": lambda: processor._main_content_to_markdown(main_content),
+    }
+    for name, func in stages.items():
+        print(f"{name:>34}: {median_ms(func, args.runs):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
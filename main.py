@@ -3,15 +3,17 @@
 Doc-Crawler Application Entry Point.
 
 Initializes and runs the PyQt6 application, setting up the main window.
+Qt and the crawl dependencies are imported lazily, so importing this module
+(or anything under `src.core`) stays cheap for headless use.
 """
 import sys
-from PyQt6.QtWidgets import QApplication
-
-from src.ui.main_window import MainWindow
 
 
 def main():
     """Initializes the Qt application and the main window."""
+    from PyQt6.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
 
     app.setApplicationName("Doc-Crawler")
@@ -0,0 +1,61 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class CrawlBudget:
+    """
+    Data class to hold the limits of a crawl and the usage counted against them.
+
+    A limit of None is unlimited. The crawler checks the budget before issuing
+    each fetch, so an exhausted budget stops the crawl after the request in
+    flight completes. The crawler records pages and bytes itself; tokens come
+    from whoever converts the pages, which must call `record_tokens` for each
+    yielded page (as `CrawlWorker` does) for `max_tokens` to apply.
+    """
+    max_pages: Optional[int] = None
+    max_bytes: Optional[int] = None
+    max_seconds: Optional[float] = None
+    max_tokens: Optional[int] = None
+
+    pages: int = field(default=0, init=False)
+    bytes: int = field(default=0, init=False)
+    tokens: int = field(default=0, init=False)
+    started_at: Optional[float] = field(default=None, init=False)
+    stop_reason: Optional[str] = field(default=None, init=False)
+
+    def start(self):
+        """Resets the usage from any previous crawl and starts the wall-time clock."""
+        self.pages = 0
+        self.bytes = 0
+        self.tokens = 0
+        self.stop_reason = None
+        self.started_at = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+
+    def record_page(self, size_bytes: int):
+        """Counts one page that was actually requested, and its body size."""
+        self.pages += 1
+        self.bytes += size_bytes
+
+    def record_bytes(self, size_bytes: int):
+        """Counts bytes downloaded for something other than a page, such as a sitemap."""
+        self.bytes += size_bytes
+
+    def record_tokens(self, tokens: int):
+        self.tokens += tokens
+
+    def exhausted_reason(self) -> Optional[str]:
+        """Returns a description of the first limit reached, or None."""
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return f"Page budget reached ({self.pages} pages)"
+        if self.max_bytes is not None and self.bytes >= self.max_bytes:
+            return f"Byte budget reached ({self.bytes:,} bytes)"
+        if self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            return f"Time budget reached ({self.elapsed():.1f} seconds)"
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return f"Token budget reached ({self.tokens:,} tokens)"
+        return None
@@ -1,12 +1,17 @@
 import asyncio
-from typing import Set, List, Optional, AsyncGenerator
+from typing import Set, List, Optional, AsyncGenerator, Dict, Iterable
 from urllib.parse import urljoin, urlparse, urlunparse
 from urllib.robotparser import RobotFileParser
-from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+
+from src.core.scope import CrawlScope
+from src.core.frontier import PriorityFrontier, SitemapEntry
+from src.core.budget import CrawlBudget
+from src.core.dedup import NearDuplicateIndex, simhash
+from src.core.extraction import extract_main_content
 
 @dataclass
 class CrawlResult:
@@ -18,6 +23,12 @@ class CrawlResult:
     links: List[str]
     error: Optional[str] = None
     is_redirect: bool = False
+    size_bytes: int = 0
+    fetched: bool = True
+    is_duplicate: bool = False
+    duplicate_of: Optional[str] = None
+    # Junk-stripped main content, extracted once and shared with ContentProcessor.
+    main_content: Optional[Tag] = field(default=None, repr=False)
 
 class Crawler:
     """An asynchronous, concurrent web crawler."""
@@ -26,9 +37,23 @@ class Crawler:
         self,
         respect_robots: bool = True,
         concurrency_limit: int = 10,
+        dedup_index: Optional[NearDuplicateIndex] = None,
+        follow_duplicate_links: bool = False,
+        scope: Optional[CrawlScope] = None,
+        priority_prefixes: Iterable[str] = (),
+        use_sitemap: bool = False,
+        max_sitemaps: int = 1,
+        max_sitemap_bytes: int = 1024 * 1024,
         user_agent: str = "Doc-Crawler/1.1 (+https://github.com/your/repo)"
     ):
         self.respect_robots = respect_robots
+        self.dedup_index = dedup_index
+        self.follow_duplicate_links = follow_duplicate_links
+        self.scope = scope or CrawlScope()
+        self.priority_prefixes = list(priority_prefixes)
+        self.use_sitemap = use_sitemap
+        self.max_sitemaps = max_sitemaps
+        self.max_sitemap_bytes = max_sitemap_bytes
         self.client = httpx.AsyncClient(
             headers={'User-Agent': user_agent},
             timeout=20.0,
@@ -42,23 +67,29 @@ class Crawler:
         await self.client.aclose()
 
     def _normalize_url(self, url: str) -> str:
-        """Normalizes a URL by lowercasing the scheme/netloc and removing fragments."""
+        """
+        Normalizes a URL by lowercasing the scheme/netloc and removing fragments.
+
+        Query parameters and trailing slashes are handled per the crawl scope.
+        """
         parsed = urlparse(url)
+        path = parsed.path.rstrip('/') if self.scope.strip_trailing_slash else parsed.path
         return urlunparse((
             parsed.scheme.lower(),
             parsed.netloc.lower(),
-            parsed.path.rstrip('/'),
-            '', '', ''  # Remove params, query, fragment
+            path,
+            '', self.scope.filter_query(parsed.query), ''  # Remove params and fragment
         ))
 
     def _is_valid_url(self, url: str, base_domain: str) -> bool:
-        """Checks if a URL is valid and belongs to the same domain."""
+        """Checks if a URL is valid and falls within the crawl scope."""
         parsed = urlparse(url)
-        return all([
-            parsed.scheme in ['http', 'https'],
-            parsed.netloc,
-            parsed.netloc.lower() == base_domain.lower()
-        ])
+        return bool(
+            parsed.scheme in ('http', 'https')
+            and parsed.netloc
+            and self.scope.allows_host(parsed.netloc, base_domain)
+            and self.scope.allows_path(parsed.path)
+        )
 
     async def _can_fetch(self, url: str) -> bool:
         """Checks if crawling is allowed by the domain's robots.txt file."""
@@ -84,20 +115,117 @@ class Crawler:
     def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extracts and normalizes all valid links from a parsed HTML document."""
         links = []
+        seen_hrefs: Set[str] = set()
         base_domain = urlparse(base_url).netloc
         for link in soup.find_all('a', href=True):
             href = link['href']
+            # Navigation-heavy pages repeat the same hrefs many times over.
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
             absolute_url = urljoin(base_url, href)
             normalized_url = self._normalize_url(absolute_url)
             if self._is_valid_url(normalized_url, base_domain):
                 links.append(normalized_url)
         return links
 
+    def _canonical_url(self, soup: BeautifulSoup, page_url: str) -> Optional[str]:
+        """Returns the page's in-scope `<link rel="canonical">` URL, if it declares one."""
+        canonical = soup.find('link', rel='canonical', href=True)
+        if not canonical:
+            return None
+        canonical_url = self._normalize_url(urljoin(page_url, canonical['href']))
+        if self._is_valid_url(canonical_url, urlparse(page_url).netloc):
+            return canonical_url
+        return None
+
+    def _find_duplicate(self, main_content: Tag, url: str) -> Optional[str]:
+        """Returns the URL of an earlier page whose main content `url` nearly duplicates."""
+        fingerprint = simhash(main_content.get_text(' '))
+        if fingerprint is None:
+            return None
+        return self.dedup_index.check_and_add(url, fingerprint)
+
+    async def _read_sitemap(
+        self, sitemap_url: str, budget: CrawlBudget, cancel_event: asyncio.Event
+    ) -> Optional[bytes]:
+        """
+        Downloads one sitemap, counting its bytes against `budget`.
+
+        Returns None if the sitemap is unreadable, larger than `max_sitemap_bytes`,
+        or the crawl is cancelled or out of budget while it downloads.
+        """
+        chunks = []
+        size = 0
+        async with self.semaphore:
+            async with self.client.stream('GET', sitemap_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    budget.record_bytes(len(chunk))
+                    if size > self.max_sitemap_bytes:
+                        return None
+                    if cancel_event.is_set() or budget.exhausted_reason():
+                        return None
+                    chunks.append(chunk)
+        return b''.join(chunks)
+
+    async def _load_sitemap(
+        self, start_url: str, delay: float, budget: CrawlBudget, cancel_event: asyncio.Event
+    ) -> Dict[str, SitemapEntry]:
+        """
+        Collects sitemap priority/lastmod hints for the start URL's domain.
+
+        Sitemaps listed in robots.txt are used when available, falling back to
+        `/sitemap.xml`. Sitemap indexes are followed up to `max_sitemaps` files.
+        Sitemap downloads are followed by the crawl delay, count towards the
+        byte budget and stop as soon as the crawl is cancelled or out of budget.
+        """
+        parsed = urlparse(start_url)
+        domain = f"{parsed.scheme}://{parsed.netloc}"
+        rp = self.robots_cache.get(domain)
+        pending = list((rp.site_maps() if rp else None) or [urljoin(domain, "/sitemap.xml")])
+
+        entries: Dict[str, SitemapEntry] = {}
+        fetched = 0
+        while pending and fetched < self.max_sitemaps:
+            if cancel_event.is_set() or budget.exhausted_reason():
+                break
+
+            sitemap_url = pending.pop(0)
+            fetched += 1
+            try:
+                content = await self._read_sitemap(sitemap_url, budget, cancel_event)
+                soup = BeautifulSoup(content, 'xml') if content is not None else None
+            except Exception:
+                soup = None  # Sitemaps are only hints; ignore unreadable ones
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if soup is None:
+                continue
+
+            for sitemap in soup.find_all('sitemap'):
+                if loc := sitemap.find('loc'):
+                    pending.append(loc.get_text(strip=True))
+
+            for url_tag in soup.find_all('url'):
+                loc = url_tag.find('loc')
+                if not loc:
+                    continue
+                priority = url_tag.find('priority')
+                lastmod = url_tag.find('lastmod')
+                entries[self._normalize_url(loc.get_text(strip=True))] = SitemapEntry.from_strings(
+                    priority.get_text(strip=True) if priority else None,
+                    lastmod.get_text(strip=True) if lastmod else None
+                )
+        return entries
+
     async def _fetch_page(self, url: str) -> CrawlResult:
         """Fetches and processes a single web page."""
         if not await self._can_fetch(url):
             return CrawlResult(url=url, status_code=403, content=None, title=None,
-                               links=[], error="Blocked by robots.txt")
+                               links=[], error="Blocked by robots.txt", fetched=False)
         try:
             async with self.semaphore:
                 response = await self.client.get(url)
@@ -110,17 +238,30 @@ class Crawler:
             title = soup.find('title').get_text(strip=True) if soup.title else "No Title"
             links = self._extract_links(soup, final_url)
 
+            if self.scope.prefer_canonical:
+                final_url = self._canonical_url(soup, final_url) or final_url
+
+            # Serialize before extraction, which strips junk from the soup in place.
+            content = str(soup)
+            main_content = extract_main_content(soup)
+            duplicate_of = self._find_duplicate(main_content, final_url) if self.dedup_index else None
+
             return CrawlResult(
                 url=final_url,
-                content=str(soup),
+                content=content,
                 title=title,
                 links=links,
                 status_code=response.status_code,
-                is_redirect=is_redirect
+                is_redirect=is_redirect,
+                size_bytes=len(response.content),
+                is_duplicate=duplicate_of is not None,
+                duplicate_of=duplicate_of,
+                main_content=main_content
             )
         except httpx.HTTPStatusError as e:
             return CrawlResult(url=url, status_code=e.response.status_code,
-                               content=None, title=None, links=[], error=str(e))
+                               content=None, title=None, links=[], error=str(e),
+                               size_bytes=len(e.response.content))
         except Exception as e:
             return CrawlResult(url=url, status_code=0, content=None, title=None,
                                links=[], error=str(e))
@@ -130,35 +271,82 @@ class Crawler:
         start_url: str,
         max_depth: int,
         delay: float,
-        cancel_event: asyncio.Event
+        cancel_event: asyncio.Event,
+        budget: Optional[CrawlBudget] = None
     ) -> AsyncGenerator[CrawlResult, None]:
         """
         Crawls a website starting from `start_url` up to `max_depth`.
 
+        Pages are fetched depth by depth, in priority order within each depth
+        (see `PriorityFrontier`), so a capped or cancelled crawl ends with the
+        most valuable pages reached so far.
+        The `budget`, if given, is checked before each fetch; when it runs out
+        the crawl stops and `budget.stop_reason` records why. The crawler counts
+        pages and bytes for every request it makes, error bodies included. It
+        produces no output text, so `max_tokens` only applies if the consumer
+        calls `budget.record_tokens` for each yielded page.
+
         Yields:
-            CrawlResult for each page processed.
+            CrawlResult for each page processed. With a `dedup_index`, near-duplicate
+            pages are flagged `is_duplicate` and, unless `follow_duplicate_links`
+            is set, their links are not expanded.
         """
+        if budget is None:
+            budget = CrawlBudget()
+        budget.start()
+
         start_url = self._normalize_url(start_url)
-        queue = deque([(start_url, 0)])
+        frontier = PriorityFrontier(
+            priority_prefixes=self.priority_prefixes or [urlparse(start_url).path]
+        )
+        if self.use_sitemap and max_depth > 0:
+            await self._can_fetch(start_url)  # Loads robots.txt and its Sitemap entries
+            frontier.sitemap = await self._load_sitemap(start_url, delay, budget, cancel_event)
+
+        frontier.push(start_url, 0)
         visited: Set[str] = {start_url}
+        emitted: Set[str] = set()
 
-        while queue:
+        while frontier:
             if cancel_event.is_set():
                 break
 
-            url, depth = queue.popleft()
+            if reason := budget.exhausted_reason():
+                budget.stop_reason = reason
+                break
+
+            url, depth = frontier.pop()
 
             result = await self._fetch_page(url)
+            if result.fetched:
+                budget.record_page(result.size_bytes)
+
+            # A redirect or canonical link may name a page that was already emitted
+            # or is still queued; emit each URL once.
+            if not result.error and not result.is_duplicate and result.url != url:
+                if result.url in emitted:
+                    result.is_duplicate = True
+                    result.duplicate_of = result.url
+                    result.url = url
+                else:
+                    frontier.discard(result.url)
+
+            if not result.error and not result.is_duplicate:
+                emitted.add(result.url)
             yield result
 
-            if result.error:
-                continue
+            if not result.error:
+                # The page may have been reported under its redirect or canonical URL.
+                visited.add(result.url)
 
-            if depth < max_depth:
+            expand = not result.error and (self.follow_duplicate_links or not result.is_duplicate)
+            if expand and depth < max_depth:
                 for link in result.links:
-                    if link not in visited:
+                    # Links to already-queued pages raise their popularity.
+                    if link not in visited or link in frontier:
                         visited.add(link)
-                        queue.append((link, depth + 1))
-            
-            if delay > 0:
+                        frontier.push(link, depth + 1)
+
+            # Every request, including failed and duplicate pages, is followed by the delay.
+            if delay > 0 and result.fetched:
                 await asyncio.sleep(delay)
\ No newline at end of file
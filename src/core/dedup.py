@@ -0,0 +1,84 @@
+import re
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+FINGERPRINT_BITS = 64
+_DIGEST_SIZE = FINGERPRINT_BITS // 8
+_HASH_MASK = (1 << FINGERPRINT_BITS) - 1
+_TOKEN_PATTERN = re.compile(r'\w+')
+# For each bit of a byte, maps every byte value to 1 if it has that bit set, else 0.
+_BIT_TABLES = [bytes(value >> bit & 1 for value in range(256)) for bit in range(8)]
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """
+    Computes a 64-bit SimHash fingerprint of `text` over word shingles.
+
+    Rather than updating 64 bit weights per shingle in Python, the shingle
+    hashes are packed into one byte string and each bit's weight is counted
+    with C-level `bytes.translate`/`bytes.count` over one byte column. Shingles
+    are hashed with Python's (per-process salted) `hash`, so fingerprints are
+    only comparable within one process, which is all a crawl's index needs.
+
+    Returns None when the text has no words to fingerprint.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return None
+
+    if len(tokens) < shingle_size:
+        shingles = [tuple(tokens)]
+    else:
+        shingles = zip(*(tokens[i:] for i in range(shingle_size)))
+    digests = array('Q', [hash(shingle) & _HASH_MASK for shingle in shingles]).tobytes()
+    total = len(digests) // _DIGEST_SIZE
+
+    fingerprint = 0
+    for position in range(_DIGEST_SIZE):
+        column = digests[position::_DIGEST_SIZE]
+        # Digests are packed in native byte order.
+        shift = position * 8 if sys.byteorder == 'little' else (_DIGEST_SIZE - 1 - position) * 8
+        for bit, table in enumerate(_BIT_TABLES):
+            if 2 * column.translate(table).count(1) > total:
+                fingerprint |= 1 << (shift + bit)
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """
+    Detects near-duplicate pages by the Hamming distance of their SimHash fingerprints.
+
+    Fingerprints are split into `max_distance + 1` bands; two fingerprints within
+    `max_distance` bits must agree exactly on at least one band, so only
+    fingerprints sharing a band are compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self.band_count = max_distance + 1
+        self.band_width = FINGERPRINT_BITS // self.band_count
+        self.band_mask = (1 << self.band_width) - 1
+        self.bands: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in range(self.band_count)]
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> (i * self.band_width)) & self.band_mask
+                for i in range(self.band_count)]
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Returns the URL of an indexed page near `fingerprint`, if any."""
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            for candidate, url in band.get(key, ()):
+                if bin(candidate ^ fingerprint).count('1') <= self.max_distance:
+                    return url
+        return None
+
+    def check_and_add(self, url: str, fingerprint: int) -> Optional[str]:
+        """Returns the URL of the page `url` duplicates, or indexes it and returns None."""
+        original = self.find(fingerprint)
+        if original is not None:
+            return original
+
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            band.setdefault(key, []).append((fingerprint, url))
+        return None
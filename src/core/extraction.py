@@ -0,0 +1,39 @@
+import soupsieve as sv
+from bs4 import BeautifulSoup, Comment, Tag
+
+# Shared, precompiled state: built once at import rather than per page.
+JUNK_SELECTORS = (
+    'script', 'style', 'nav', 'footer', 'aside', 'header', 'menu',
+    '[role="navigation"]', '[role="banner"]', '[role="contentinfo"]',
+    '[id*="cookie"]', '[class*="cookie"]', '[id*="consent"]', '[class*="consent"]',
+    '[id*="sidebar"]', '[class*="sidebar"]', '[id*="popup"]', '[class*="popup"]',
+    '[class*="social"]', '[class*="related"]', '[class*="advert"]'
+)
+CONTENT_SELECTORS = ('main', 'article', '[role="main"]', '.main-content', '.content', '#main', '#content')
+
+# One combined selector walks the document once instead of once per junk selector.
+_JUNK_MATCHER = sv.compile(', '.join(JUNK_SELECTORS))
+_CONTENT_MATCHERS = tuple(sv.compile(selector) for selector in CONTENT_SELECTORS)
+
+
+def extract_main_content(soup: BeautifulSoup) -> Tag:
+    """
+    Strips junk elements and comments from `soup` in place and returns its main content.
+
+    Used both for Markdown conversion and for near-duplicate fingerprinting, so
+    both see the same text.
+    """
+    for tag in _JUNK_MATCHER.select(soup):
+        # Junk nested in already-removed junk was destroyed with its parent.
+        if not tag.decomposed:
+            tag.decompose()
+
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    main_content = None
+    for matcher in _CONTENT_MATCHERS:
+        if main_content := matcher.select_one(soup):
+            break
+
+    return main_content or soup.body or soup
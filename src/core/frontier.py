@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.core.scope import PrefixTrie
+
+
+@dataclass
+class SitemapEntry:
+    """Data class to hold the sitemap hints for a single URL."""
+    priority: float = 0.5
+    lastmod: Optional[datetime] = None
+
+    @classmethod
+    def from_strings(cls, priority: Optional[str], lastmod: Optional[str]) -> 'SitemapEntry':
+        """Builds an entry from raw sitemap values, ignoring malformed ones."""
+        entry = cls()
+        if priority:
+            try:
+                entry.priority = min(max(float(priority), 0.0), 1.0)
+            except ValueError:
+                pass
+        if lastmod:
+            try:
+                parsed = datetime.fromisoformat(lastmod)
+                entry.lastmod = parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+        return entry
+
+
+class PriorityFrontier:
+    """
+    A heap-based crawl frontier that pops the shallowest, highest-scoring URL first.
+
+    URLs are popped depth band by depth band, so every page is reached at its
+    shortest link depth and `max_depth` cuts off the same pages as BFS. Within a
+    band, URLs are ordered by a score combining a match against the priority
+    path prefixes, sitemap priority and freshness, and the number of links seen
+    pointing at them. Re-pushing a queued URL rescores it in O(log n) by
+    invalidating its old heap entry. Equal scores pop in insertion order.
+    """
+
+    _REMOVED = None
+
+    def __init__(
+        self,
+        priority_prefixes: Iterable[str] = (),
+        sitemap: Optional[Dict[str, SitemapEntry]] = None,
+        prefix_weight: float = 2.0,
+        sitemap_weight: float = 2.0,
+        freshness_weight: float = 1.0,
+        popularity_weight: float = 0.5
+    ):
+        self.priority_prefixes = PrefixTrie(priority_prefixes)
+        self.sitemap = sitemap or {}
+        self.prefix_weight = prefix_weight
+        self.sitemap_weight = sitemap_weight
+        self.freshness_weight = freshness_weight
+        self.popularity_weight = popularity_weight
+
+        self.heap: List[list] = []
+        self.entries: Dict[str, list] = {}
+        self.depths: Dict[str, int] = {}
+        self.inlinks: Dict[str, int] = {}
+        self.counter = itertools.count()
+        self.now = datetime.now(timezone.utc)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def score(self, url: str) -> float:
+        """Returns the priority of `url` within its depth band; higher is crawled sooner."""
+        score = 0.0
+        if not self.priority_prefixes.empty and self.priority_prefixes.matches(urlparse(url).path):
+            score += self.prefix_weight
+
+        entry = self.sitemap.get(url)
+        if entry:
+            score += self.sitemap_weight * entry.priority
+            if entry.lastmod:
+                age_days = max((self.now - entry.lastmod).days, 0)
+                score += self.freshness_weight / (1 + age_days / 30)
+
+        score += self.popularity_weight * math.log1p(self.inlinks.get(url, 0))
+        return score
+
+    def push(self, url: str, depth: int):
+        """Queues `url`, or rescores it if already queued, counting one more inlink."""
+        self.inlinks[url] = self.inlinks.get(url, 0) + 1
+        if url in self.entries:
+            depth = min(depth, self.depths[url])
+            self.entries.pop(url)[-1] = self._REMOVED
+
+        self.depths[url] = depth
+        entry = [depth, -self.score(url), next(self.counter), url]
+        self.entries[url] = entry
+        heapq.heappush(self.heap, entry)
+        self._compact()
+
+    def discard(self, url: str):
+        """Removes `url` from the frontier if it is queued."""
+        if url in self.entries:
+            self.entries.pop(url)[-1] = self._REMOVED
+            del self.depths[url]
+            self._compact()
+
+    def _compact(self):
+        """Drops invalidated entries once they make up more than half the heap."""
+        if len(self.heap) > 2 * len(self.entries):
+            self.heap = [entry for entry in self.heap if entry[-1] is not self._REMOVED]
+            heapq.heapify(self.heap)
+
+    def pop(self) -> Tuple[str, int]:
+        """Removes and returns the highest-priority `(url, depth)` pair."""
+        while self.heap:
+            url = heapq.heappop(self.heap)[-1]
+            if url is not self._REMOVED:
+                del self.entries[url]
+                return url, self.depths.pop(url)
+        raise KeyError("pop from an empty frontier")
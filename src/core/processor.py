@@ -1,7 +1,19 @@
 import re
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, Tag
 from markdownify import markdownify as md
 from src.core.crawler import CrawlResult
+from src.core.extraction import extract_main_content
+
+# Shared, precompiled state: built once at import rather than per ContentProcessor.
+GIBBERISH_PATTERN = re.compile(r'\b[A-Za-z0-9+/=]{100,}\b')
+_BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+
+# 'a' and 'img' are correctly placed only in the 'convert' list.
+MARKDOWNIFY_OPTIONS = {
+    'heading_style': 'ATX',
+    'bullets': '-',
+    'convert': ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'li', 'a', 'img', 'pre', 'code'],
+}
 
 class ContentProcessor:
     def __init__(self, 
@@ -10,45 +22,12 @@ class ContentProcessor:
                  preserve_links: bool = True,
                  preserve_images: bool = True):
         
-        self.junk_selectors = [
-            'script', 'style', 'nav', 'footer', 'aside', 'header', 'menu',
-            '[role="navigation"]', '[role="banner"]', '[role="contentinfo"]',
-            '[id*="cookie"]', '[class*="cookie"]', '[id*="consent"]', '[class*="consent"]',
-            '[id*="sidebar"]', '[class*="sidebar"]', '[id*="popup"]', '[class*="popup"]',
-            '[class*="social"]', '[class*="related"]', '[class*="advert"]'
-        ]
-        
-        self.gibberish_pattern = re.compile(r'\b[A-Za-z0-9+/=]{100,}\b')
+        self.gibberish_pattern = GIBBERISH_PATTERN
         self.min_line_length = 5
-
-        # <<< FIX: The invalid 'strip' key has been removed.
-        # 'a' and 'img' are correctly placed only in the 'convert' list.
-        self.markdownify_options = {
-            'heading_style': 'ATX',
-            'bullets': '-',
-            'convert': ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'li', 'a', 'img', 'pre', 'code'],
-        }
+        self.markdownify_options = MARKDOWNIFY_OPTIONS
     
-    def _extract_main_content(self, html_content: str) -> str:
-        soup = BeautifulSoup(html_content, 'lxml')
-        
-        for selector in self.junk_selectors:
-            for tag in soup.select(selector):
-                tag.decompose()
-        
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
-
-        content_selectors = ['main', 'article', '[role="main"]', '.main-content', '.content', '#main', '#content']
-        main_content = None
-        for selector in content_selectors:
-            if main_content := soup.select_one(selector):
-                break
-        
-        if not main_content:
-            main_content = soup.body or soup
-            
-        return str(main_content)
+    def _extract_main_content(self, html_content: str) -> Tag:
+        return extract_main_content(BeautifulSoup(html_content, 'lxml'))
     
     def _clean_markdown(self, markdown_content: str) -> str:
         lines = markdown_content.split('\n')
@@ -73,7 +52,7 @@ class ContentProcessor:
             cleaned_lines.append(line)
 
         markdown_content = '\n'.join(cleaned_lines)
-        markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        markdown_content = _BLANK_LINES_PATTERN.sub('\n\n', markdown_content)
         markdown_content = markdown_content.strip()
         
         return markdown_content
@@ -87,17 +66,22 @@ class ContentProcessor:
         ]
         return '\n'.join(metadata_lines)
     
+    def _main_content_to_markdown(self, main_content: Tag) -> str:
+        try:
+            markdown_content = md(str(main_content), **self.markdownify_options)
+            return self._clean_markdown(markdown_content)
+        except Exception as e:
+            # This exception block is what correctly caught and reported the error.
+            return f"Error processing HTML content: {str(e)}"
+
     def html_to_markdown(self, html_content: str) -> str:
         if not html_content or not html_content.strip():
             return ""
         try:
-            main_content_html = self._extract_main_content(html_content)
-            markdown_content = md(main_content_html, **self.markdownify_options)
-            cleaned_markdown = self._clean_markdown(markdown_content)
-            return cleaned_markdown
+            main_content = self._extract_main_content(html_content)
         except Exception as e:
-            # This exception block is what correctly caught and reported the error.
             return f"Error processing HTML content: {str(e)}"
+        return self._main_content_to_markdown(main_content)
     
     def process_crawl_result(self, crawl_result: CrawlResult, include_metadata: bool = True) -> str:
         if crawl_result.error:
@@ -105,10 +89,15 @@ class ContentProcessor:
                     f"**URL:** `{crawl_result.url}`\n"
                     f"**Error:** {crawl_result.error}\n")
         
-        if not crawl_result.content:
+        # Near-duplicates flagged by the crawler are dropped before conversion.
+        if not crawl_result.content or crawl_result.is_duplicate:
             return ""
 
-        markdown_content = self.html_to_markdown(crawl_result.content)
+        # Reuse the crawler's parse and extraction when it is available.
+        if crawl_result.main_content is not None:
+            markdown_content = self._main_content_to_markdown(crawl_result.main_content)
+        else:
+            markdown_content = self.html_to_markdown(crawl_result.content)
         
         if not markdown_content.strip():
             return ""
@@ -0,0 +1,143 @@
+import re
+import fnmatch
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+
+class PrefixTrie:
+    """A character trie answering whether any stored prefix starts a given string."""
+
+    _TERMINAL = None
+
+    def __init__(self, prefixes: Iterable[str] = ()):
+        self.root: dict = {}
+        self.empty = True
+        for prefix in prefixes:
+            self.add(prefix)
+
+    def add(self, prefix: str):
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._TERMINAL] = True
+        self.empty = False
+
+    def matches(self, text: str) -> bool:
+        """Returns True if some stored prefix is a prefix of `text`, in O(len(text))."""
+        node = self.root
+        if self._TERMINAL in node:
+            return True
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return False
+            if self._TERMINAL in node:
+                return True
+        return False
+
+
+class CrawlScope:
+    """
+    Compiled URL canonicalisation and crawl-scope rules.
+
+    Prefixes, regexes and globs are all evaluated against the URL path. Exclude
+    rules win over include rules; when no include rules are given every path on
+    an allowed host is in scope. Regexes use `re.search` and are compiled one by
+    one, so inline flags and backreferences behave as they would alone; globs
+    must match the whole path and are combined into a single regex.
+    """
+
+    def __init__(
+        self,
+        include_prefixes: Iterable[str] = (),
+        exclude_prefixes: Iterable[str] = (),
+        include_patterns: Iterable[str] = (),
+        exclude_patterns: Iterable[str] = (),
+        include_globs: Iterable[str] = (),
+        exclude_globs: Iterable[str] = (),
+        allowed_domains: Iterable[str] = (),
+        include_subdomains: bool = False,
+        allowed_query_params: Iterable[str] = (),
+        strip_trailing_slash: bool = True,
+        prefer_canonical: bool = False
+    ):
+        self.include_prefixes = PrefixTrie(include_prefixes)
+        self.exclude_prefixes = PrefixTrie(exclude_prefixes)
+        self.include_regexes = self._compile_patterns(include_patterns)
+        self.exclude_regexes = self._compile_patterns(exclude_patterns)
+        self.include_globs = self._compile_globs(include_globs)
+        self.exclude_globs = self._compile_globs(exclude_globs)
+        self.has_include_rules = bool(
+            not self.include_prefixes.empty or self.include_regexes or self.include_globs
+        )
+
+        self.allowed_domains: Tuple[str, ...] = tuple(d.lower().strip('.') for d in allowed_domains)
+        self.include_subdomains = include_subdomains
+        self.allowed_query_params = frozenset(allowed_query_params)
+        self.strip_trailing_slash = strip_trailing_slash
+        self.prefer_canonical = prefer_canonical
+        self._host_cache: Dict[Tuple[str, str], bool] = {}
+
+    @staticmethod
+    def _compile_patterns(patterns: Iterable[str]) -> Tuple[re.Pattern, ...]:
+        """Compiles each user regex separately, naming the pattern if it is invalid."""
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern))
+            except re.error as e:
+                raise ValueError(f"Invalid scope pattern {pattern!r}: {e}") from e
+        return tuple(compiled)
+
+    @staticmethod
+    def _compile_globs(globs: Iterable[str]) -> Optional[re.Pattern]:
+        """Combines globs into one alternation so each path is scanned once."""
+        sources = [f"(?:{fnmatch.translate(glob)})" for glob in globs]
+        return re.compile('|'.join(sources)) if sources else None
+
+    @staticmethod
+    def _matches(path: str, regexes: Tuple[re.Pattern, ...], globs: Optional[re.Pattern]) -> bool:
+        if globs is not None and globs.match(path):
+            return True
+        return any(regex.search(path) for regex in regexes)
+
+    def filter_query(self, query: str) -> str:
+        """Keeps only allowlisted query parameters, in a stable order."""
+        if not query or not self.allowed_query_params:
+            return ''
+        kept = [(key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+                if key in self.allowed_query_params]
+        return urlencode(sorted(kept))
+
+    def allows_host(self, host: str, base_domain: str) -> bool:
+        """Checks `host` against the allowed domains, defaulting to `base_domain`."""
+        key = (host, base_domain)
+        if key not in self._host_cache:
+            host = host.lower()
+            domains = self.allowed_domains or (base_domain.lower(),)
+            self._host_cache[key] = any(
+                host == domain or (self.include_subdomains and host.endswith('.' + domain))
+                for domain in domains
+            )
+        return self._host_cache[key]
+
+    def allows_path(self, path: str) -> bool:
+        """
+        Applies the exclude rules, then the include rules, to a URL path.
+
+        Paths lose their trailing slash during normalization, so prefixes are
+        matched as if it were still there: `/2/` matches the `/2` version root.
+        """
+        prefix_path = path
+        if self.strip_trailing_slash and not path.endswith('/'):
+            prefix_path = path + '/'
+
+        if self.exclude_prefixes.matches(prefix_path):
+            return False
+        if self._matches(path, self.exclude_regexes, self.exclude_globs):
+            return False
+        if not self.has_include_rules:
+            return True
+        if self.include_prefixes.matches(prefix_path):
+            return True
+        return self._matches(path, self.include_regexes, self.include_globs)
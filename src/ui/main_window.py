@@ -8,6 +8,8 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QTextCursor, QFont
 
+from src.core.scope import CrawlScope
+from src.core.budget import CrawlBudget
 from src.workers.crawl_worker import CrawlWorker
 
 class MainWindow(QMainWindow):
@@ -69,9 +71,43 @@ class MainWindow(QMainWindow):
         self.autosave_checkbox = QCheckBox("Autosave results")
         self.autosave_checkbox.setChecked(True)
         input_layout.addWidget(self.autosave_checkbox, 4, 0, 1, 2)
+
+        self.dedup_checkbox = QCheckBox("Skip near-duplicate pages")
+        self.dedup_checkbox.setChecked(True)
+        input_layout.addWidget(self.dedup_checkbox, 5, 0, 1, 2)
+
+        input_layout.addWidget(QLabel("Exclude Paths:"), 6, 0)
+        self.exclude_input = QLineEdit()
+        self.exclude_input.setPlaceholderText("/2/, /changelog, */whatsnew/*")
+        input_layout.addWidget(self.exclude_input, 6, 1)
+
+        self.subdomains_checkbox = QCheckBox("Include subdomains")
+        input_layout.addWidget(self.subdomains_checkbox, 7, 0, 1, 2)
+
+        self.canonical_checkbox = QCheckBox("Prefer canonical URLs")
+        input_layout.addWidget(self.canonical_checkbox, 8, 0, 1, 2)
+
+        self.sitemap_checkbox = QCheckBox("Prioritize by sitemap")
+        input_layout.addWidget(self.sitemap_checkbox, 9, 0, 1, 2)
         
         layout.addWidget(input_group)
 
+        budget_group = QGroupBox("Crawl Budget")
+        budget_layout = QGridLayout(budget_group)
+        self.max_pages_spinbox = self._create_budget_spinbox(1_000_000, 100)
+        self.max_size_spinbox = self._create_budget_spinbox(100_000, 10)
+        self.max_time_spinbox = self._create_budget_spinbox(86_400, 60)
+        self.max_tokens_spinbox = self._create_budget_spinbox(1_000_000_000, 10_000)
+        for row, (label, spinbox) in enumerate([
+            ("Max Pages:", self.max_pages_spinbox),
+            ("Max Size (MB):", self.max_size_spinbox),
+            ("Max Time (s):", self.max_time_spinbox),
+            ("Max Tokens:", self.max_tokens_spinbox),
+        ]):
+            budget_layout.addWidget(QLabel(label), row, 0)
+            budget_layout.addWidget(spinbox, row, 1)
+        layout.addWidget(budget_group)
+
         buttons_layout = QHBoxLayout()
         self.start_button = QPushButton("Start Crawl")
         self.start_button.clicked.connect(self.start_crawl)
@@ -106,6 +142,13 @@ class MainWindow(QMainWindow):
         layout.addStretch()
         return panel
 
+    def _create_budget_spinbox(self, maximum: int, step: int) -> QSpinBox:
+        spinbox = QSpinBox()
+        spinbox.setRange(0, maximum)
+        spinbox.setSingleStep(step)
+        spinbox.setSpecialValueText("Unlimited")
+        return spinbox
+
     def _create_output_panel(self) -> QWidget:
         panel = QWidget()
         layout = QVBoxLayout(panel)
@@ -150,12 +193,45 @@ class MainWindow(QMainWindow):
         except Exception:
             return f"crawl_output-{datetime.now().strftime('%d%m%y')}.md"
 
+    def _build_scope(self, url: str) -> CrawlScope:
+        """Builds the crawl scope from the configuration panel."""
+        entries = [e.strip() for e in self.exclude_input.text().split(',') if e.strip()]
+        globs = [e for e in entries if any(c in e for c in '*?[')]
+        prefixes = [e for e in entries if e not in globs]
+
+        allowed_domains = []
+        if self.subdomains_checkbox.isChecked():
+            host = urlparse(url).netloc.lower()
+            allowed_domains.append(host[4:] if host.startswith('www.') else host)
+
+        return CrawlScope(
+            exclude_prefixes=prefixes,
+            exclude_globs=globs,
+            allowed_domains=allowed_domains,
+            include_subdomains=self.subdomains_checkbox.isChecked(),
+            prefer_canonical=self.canonical_checkbox.isChecked()
+        )
+
+    def _build_budget(self) -> CrawlBudget:
+        """Builds the crawl budget from the configuration panel; 0 means unlimited."""
+        return CrawlBudget(
+            max_pages=self.max_pages_spinbox.value() or None,
+            max_bytes=self.max_size_spinbox.value() * 1024 * 1024 or None,
+            max_seconds=self.max_time_spinbox.value() or None,
+            max_tokens=self.max_tokens_spinbox.value() or None
+        )
+
     def _format_stats_as_markdown(self, stats: dict) -> str:
         """Converts the stats dictionary to a readable Markdown string."""
         success_count = len(stats["successful_urls"])
         fail_count = len(stats["failed_urls"])
-        total_urls = success_count + fail_count
+        duplicate_count = len(stats.get("duplicate_urls", []))
+        total_urls = success_count + fail_count + duplicate_count
         duration = stats.get("duration_seconds", 0)
+
+        def limit(key: str, unit: str = "") -> str:
+            value = stats.get(key)
+            return f"{value:,}{unit}" if value is not None else "Unlimited"
         
         lines = [
             f"# Crawl Statistics for `{stats['start_url']}`",
@@ -165,15 +241,23 @@ class MainWindow(QMainWindow):
             f"- **Total URLs Processed:** `{total_urls}`",
             f"- **Successful Pages:** `{success_count}`",
             f"- **Failed Pages:** `{fail_count}`",
+            f"- **Near-Duplicate Pages Skipped:** `{duplicate_count}`",
             f"- **Total Duration:** `{duration:.2f} seconds`",
             f"- **Total Content Size:** `{stats['total_size_bytes'] / 1024:.2f} KB`",
             f"- **Estimated Tokens:** `{stats['estimated_tokens']:,}`",
+            f"- **Stop Reason:** `{stats.get('stop_reason') or 'Completed'}`",
             "", "---", "",
             "## Configuration",
             f"- **Start URL:** `{stats['start_url']}`",
             f"- **Max Depth:** `{stats['max_depth']}`",
             f"- **Delay Between Requests:** `{stats['delay_ms']:.0f} ms`",
             f"- **Respect robots.txt:** `{stats['respect_robots']}`",
+            f"- **Skip Near-Duplicates:** `{stats.get('skip_duplicates', False)}`",
+            f"- **Prioritize by Sitemap:** `{stats.get('use_sitemap', False)}`",
+            f"- **Max Pages:** `{limit('max_pages')}`",
+            f"- **Max Size:** `{limit('max_bytes', ' bytes')}`",
+            f"- **Max Time:** `{limit('max_seconds', ' seconds')}`",
+            f"- **Max Tokens:** `{limit('max_tokens')}`",
             "", "---", "",
             f"## Successful URLs ({success_count})",
         ]
@@ -184,6 +268,12 @@ class MainWindow(QMainWindow):
             lines.append("None.")
         else:
             lines.extend([f"- `{url}`" for url in stats["failed_urls"]])
+
+        lines.extend(["", "---", "", f"## Near-Duplicate URLs ({duplicate_count})"])
+        if not stats.get("duplicate_urls"):
+            lines.append("None.")
+        else:
+            lines.extend([f"- `{url}`" for url in stats["duplicate_urls"]])
             
         return "\n".join(lines)
 
@@ -217,7 +307,11 @@ class MainWindow(QMainWindow):
             url=url,
             max_depth=self.depth_spinbox.value(),
             delay=self.delay_spinbox.value() / 1000.0,
-            respect_robots=self.robots_checkbox.isChecked()
+            respect_robots=self.robots_checkbox.isChecked(),
+            skip_duplicates=self.dedup_checkbox.isChecked(),
+            scope=self._build_scope(url),
+            budget=self._build_budget(),
+            use_sitemap=self.sitemap_checkbox.isChecked()
         )
         self.crawl_worker.page_processed.connect(self.on_page_processed)
         self.crawl_worker.crawl_finished.connect(self.on_crawl_finished)
@@ -1,9 +1,11 @@
 import asyncio
 import traceback
 import time
+from typing import Optional
 from PyQt6.QtCore import QThread, pyqtSignal
-from src.core.crawler import Crawler
-from src.core.processor import ContentProcessor
+from src.core.dedup import NearDuplicateIndex
+from src.core.scope import CrawlScope
+from src.core.budget import CrawlBudget
 
 class CrawlWorker(QThread):
     """Worker thread to run the web crawler without blocking the UI."""
@@ -14,13 +16,19 @@ class CrawlWorker(QThread):
     status_update = pyqtSignal(str)
 
     def __init__(
-        self, url: str, max_depth: int, delay: float, respect_robots: bool
+        self, url: str, max_depth: int, delay: float, respect_robots: bool,
+        skip_duplicates: bool = True, scope: Optional[CrawlScope] = None,
+        budget: Optional[CrawlBudget] = None, use_sitemap: bool = False
     ):
         super().__init__()
         self.url = url
         self.max_depth = max_depth
         self.delay = delay
         self.respect_robots = respect_robots
+        self.skip_duplicates = skip_duplicates
+        self.scope = scope
+        self.budget = budget or CrawlBudget()
+        self.use_sitemap = use_sitemap
         self._cancel_event = asyncio.Event()
 
     def cancel(self):
@@ -29,18 +37,38 @@ class CrawlWorker(QThread):
 
     async def _run_async(self):
         """The asynchronous core of the crawler task."""
+        # Imported here so httpx, bs4, lxml and markdownify load on the worker
+        # thread rather than at startup or on the GUI thread.
+        from src.core.crawler import Crawler
+        from src.core.processor import ContentProcessor
+
         start_time = time.monotonic()
-        crawler = Crawler(respect_robots=self.respect_robots)
+        crawler = Crawler(
+            respect_robots=self.respect_robots,
+            scope=self.scope,
+            use_sitemap=self.use_sitemap,
+            dedup_index=NearDuplicateIndex() if self.skip_duplicates else None
+        )
         processor = ContentProcessor()
         
-        all_results = []
+        pages_seen = 0
+        # Markdown is kept from the per-page pass so the final output needs no reconversion.
+        page_markdowns = []
         stats = {
             "start_url": self.url,
             "max_depth": self.max_depth,
             "delay_ms": self.delay * 1000,
             "respect_robots": self.respect_robots,
+            "skip_duplicates": self.skip_duplicates,
+            "use_sitemap": self.use_sitemap,
+            "max_pages": self.budget.max_pages,
+            "max_bytes": self.budget.max_bytes,
+            "max_seconds": self.budget.max_seconds,
+            "max_tokens": self.budget.max_tokens,
+            "stop_reason": None,
             "successful_urls": [],
             "failed_urls": [],
+            "duplicate_urls": [],
             "total_size_bytes": 0,
             "estimated_tokens": 0,
         }
@@ -48,27 +76,39 @@ class CrawlWorker(QThread):
         try:
             self.status_update.emit(f"Starting crawl of {self.url}...")
             async for result in crawler.crawl(
-                self.url, self.max_depth, self.delay, self._cancel_event
+                self.url, self.max_depth, self.delay, self._cancel_event, self.budget
             ):
-                all_results.append(result)
+                pages_seen += 1
+
+                if result.is_duplicate:
+                    stats["duplicate_urls"].append(f"{result.url} (Duplicate of: {result.duplicate_of})")
+                    continue
 
                 if result.error:
                     stats["failed_urls"].append(f"{result.url} (Status: {result.status_code}, Error: {result.error})")
                 else:
                     stats["successful_urls"].append(result.url)
-                    if result.content:
-                        stats["total_size_bytes"] += len(result.content.encode('utf-8'))
+                    stats["total_size_bytes"] += result.size_bytes
 
                 markdown = processor.process_crawl_result(result)
-                stats["estimated_tokens"] += len(markdown.split())
-                self.page_processed.emit(result.url, markdown, len(all_results))
+
+                tokens = len(markdown.split())
+                stats["estimated_tokens"] += tokens
+                self.budget.record_tokens(tokens)
+                if markdown:
+                    page_markdowns.append(markdown)
+                self.page_processed.emit(result.url, markdown, pages_seen)
 
             if self._cancel_event.is_set():
+                stats["stop_reason"] = "Cancelled by user"
                 self.status_update.emit("Crawl cancelled by user.")
+            elif self.budget.stop_reason:
+                stats["stop_reason"] = self.budget.stop_reason
+                self.status_update.emit(f"{self.budget.stop_reason}. Finalizing content...")
             else:
                 self.status_update.emit("Crawl completed. Finalizing content...")
 
-            combined_content = processor.process_multiple_results(all_results)
+            combined_content = "\n\n---\n\n".join(page_markdowns)
             
             stats["duration_seconds"] = time.monotonic() - start_time
             self.crawl_finished.emit(stats, combined_content)